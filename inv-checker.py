@@ -10,59 +10,100 @@ GitHub:
 Version: 1.0.0
 """
 
-import requests
+import asyncio
+import aiohttp
 import time
 import json
 import os
-from urllib.parse import quote
-from datetime import datetime, timedelta
 import random
+import sys
+from collections import Counter
+
+try:
+    import orjson  # optional, faster JSON for the cache and Steam responses
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # optional, incremental parsing of inventory pages
+except ImportError:
+    ijson = None
+
+# C decoder when available; both accept the raw response bytes
+json_loads = orjson.loads if orjson else json.loads
+
+# errors raised while decoding a response body (orjson's error subclasses json's)
+JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError) if ijson else (json.JSONDecodeError,)
 
 # RateLimiter for requirements management bcs of 429 (too many requests)
 class RateLimiter:
-    def __init__(self, base_delay=1.0, max_delay=60.0, jitter=0.2):
+    def __init__(self, base_delay=1.0, max_delay=60.0):
         self.base_delay = base_delay
         self.max_delay = max_delay
-        self.jitter = jitter
-        self.last_request_time = 0
-        self.consecutive_429 = 0
+        self._prev_delay = base_delay
+        # next free request slot on the event loop's (monotonic) clock
+        self._next_slot = 0.0
+        # no request may go out before this time (set by a 429)
+        self._paused_until = 0.0
     
-    def wait(self):
-        now = time.time()
-        elapsed = now - self.last_request_time
-        delay = self.base_delay
-        
-        jitter_amount = random.uniform(-self.jitter * delay, self.jitter * delay)
-        delay += jitter_amount
-        
-        if elapsed < delay:
-            time.sleep(delay - elapsed)
-        
-        self.last_request_time = time.time()
+    async def wait(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # every caller reserves its own slot, so concurrent coroutines stay base_delay apart
+            # (no await between reading and updating _next_slot, so no lock is needed)
+            now = loop.time()
+            slot = max(self._next_slot, now, self._paused_until)
+            self._next_slot = slot + self.base_delay
+            
+            delay = slot - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            # a 429 arrived while we slept -> drop this slot and take a fresh one after the pause
+            if loop.time() >= self._paused_until:
+                return
+    
+    def next_backoff(self):
+        # decorrelated jitter: retries of concurrent callers spread out instead of landing together
+        upper = max(self.base_delay, self._prev_delay * 3)
+        self._prev_delay = min(self.max_delay, random.uniform(self.base_delay, upper))
+        return self._prev_delay
     
-    def handle_429(self):
-        self.consecutive_429 += 1
-        delay = min(self.base_delay * (2 ** self.consecutive_429), self.max_delay)
+    async def handle_429(self):
+        delay = self.next_backoff()
         print(f"[429] Too many requests. Waiting for {delay:.1f}s before next attempt.")
-        time.sleep(delay)
+        # pause everyone, including callers already asleep on a reserved slot
+        resume = asyncio.get_running_loop().time() + delay
+        self._paused_until = max(self._paused_until, resume)
+        self._next_slot = max(self._next_slot, resume)
+        await asyncio.sleep(delay)
     
     def success(self):
-        self.consecutive_429 = 0
+        self._prev_delay = self.base_delay
 
 
 # Cache system for storing
 class PriceCache:
-    def __init__(self, cache_file='price_cache.json', cache_duration_hours=24):
+    def __init__(self, cache_file='price_cache.json', cache_duration_hours=24,
+                 negative_cache_hours=24 * 7, save_every=50):
         self.cache_file = cache_file
-        self.cache_duration = timedelta(hours=cache_duration_hours)
+        self.cache_duration = cache_duration_hours * 3600  # seconds
+        # items without a price (unlisted / unknown names) rarely change, keep them longer
+        self.negative_cache_duration = negative_cache_hours * 3600
+        self.save_every = save_every
         self.cache = self._load_cache()
+        self._dirty = 0  # sets since last save
     
     def _load_cache(self):
         if not os.path.exists(self.cache_file):
             return {}
         
         try:
-            with open(self.cache_file, 'r') as f:
+            if orjson:
+                with open(self.cache_file, 'rb') as f:
+                    return orjson.loads(f.read())
+            
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
                 cache_data = json.load(f)
                 return cache_data
         except (json.JSONDecodeError, IOError) as e:
@@ -70,9 +111,21 @@ class PriceCache:
             return {}
     
     def save_cache(self):
+        # nothing set since the last save -> file is already up to date
+        if not self._dirty:
+            return
+        
+        # write a temp file and swap it in, so a crash mid-write never leaves a broken cache
+        tmp_file = self.cache_file + '.tmp'
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f)
+            if orjson:
+                with open(tmp_file, 'wb') as f:
+                    f.write(orjson.dumps(self.cache))
+            else:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.cache, f)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = 0
         except IOError as e:
             print(f"Failed to save cache: {e}")
     
@@ -83,148 +136,246 @@ class PriceCache:
         cached_item = self.cache[item_name]
         timestamp = cached_item.get('timestamp')
         
-        if timestamp:
-            cached_time = datetime.fromtimestamp(timestamp)
-            if datetime.now() - cached_time > self.cache_duration:
-                return None
+        if cached_item.get('negative'):
+            duration = self.negative_cache_duration
+        else:
+            duration = self.cache_duration
+        
+        # timestamps are epoch seconds
+        if timestamp and time.time() - timestamp > duration:
+            return None
             
         return cached_item.get('data')
     
     def set(self, item_name, data):
         self.cache[item_name] = {
             'data': data,
-            'timestamp': datetime.now().timestamp()
+            'timestamp': time.time(),
+            'negative': data.get('price', 0.0) == 0.0
         }
-        self.save_cache()
+        # checkpoint every few sets, full save happens at the end of main
+        self._dirty += 1
+        if self._dirty >= self.save_every:
+            self.save_cache()
+
+
+# Steam formats prices for display, e.g. "1,23€", "1.234,56€", "$1,234.56", "12,--€",
+# "1 234,56 pуб.", "¥ 1,234"
+def parse_price(text):
+    digits = [i for i, ch in enumerate(text) if ch.isdigit()]
+    if not digits:
+        return 0.0
+    
+    # only separators between digits count (drops "pуб." and ",--")
+    cleaned = ''.join(ch for ch in text[digits[0]:digits[-1] + 1] if ch.isdigit() or ch in ',.')
+    
+    separators = [ch for ch in cleaned if ch in ',.']
+    if len(set(separators)) == 2:
+        # the last separator is the decimal one, the other groups thousands
+        decimal = cleaned[max(cleaned.rfind(','), cleaned.rfind('.'))]
+    elif len(separators) == 1 and len(cleaned) - cleaned.index(separators[0]) - 1 != 3:
+        decimal = separators[0]
+    else:
+        # repeated, or a single one followed by 3 digits ("1,234" in JPY) -> thousands
+        decimal = None
+    
+    if decimal:
+        whole, _, fraction = cleaned.rpartition(decimal)
+    else:
+        whole, fraction = cleaned, ''
+    whole = whole.replace(',', '').replace('.', '')
+    
+    try:
+        return float(f"{whole or 0}.{fraction or 0}")
+    except ValueError:
+        return 0.0
+
+
+# volume is display text too ("1,234"); it only feeds quantity, so bad input is just 0
+def parse_volume(text):
+    digits = ''.join(ch for ch in str(text or '') if ch.isdigit())
+    return int(digits) if digits else 0
 
 
 # API Client for prices and inventory items
+# must be created inside a running event loop (aiohttp session)
 class SteamMarketAPI:
-    def __init__(self, steam_id, cache_duration_hours=24):
+    def __init__(self, steam_id, cache_duration_hours=24, concurrency=8):
         self.steam_id = steam_id
         self.limiter = RateLimiter(base_delay=1.0)
         self.cache = PriceCache(cache_duration_hours=cache_duration_hours)
-        self.session = requests.Session() 
+        # keep idle connections to Steam open between rate limited requests
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=concurrency,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
+            ),
+            timeout=aiohttp.ClientTimeout(total=10),
+            # ask for gzip explicitly, Steam's JSON compresses several times over
+            headers={
+                'Accept-Encoding': 'gzip',
+                'User-Agent': 'inv-checker/1.0'
+            }
+        )
+        # max number of price requests in flight at once
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # market_hash_name -> future of a price request already on its way
+        self._inflight = {}
     
-    def fetch_csgo_inventory(self, count=100, lang='english'):
+    async def close(self):
+        await self.session.close()
+    
+    # yields inventory pages as they arrive, so callers can start on a page before the next one is in
+    async def iter_pages(self, count=100, lang='english'):
         appid = 730  # CS:GO
         contextid = 2  # CS:GO
         
-        url = f'http://steamcommunity.com/inventory/{self.steam_id}/{appid}/{contextid}'
+        url = f'https://steamcommunity.com/inventory/{self.steam_id}/{appid}/{contextid}'
         params = {'l': lang, 'count': count}
         
-        all_assets = []
-        descriptions = []
-        last_assetid = None
-        more_items = True
-        first = True
+        total = 0
         
-        while more_items:
-            if last_assetid:
-                params['start_assetid'] = last_assetid
-            
-            self.limiter.wait()
-            
-            max_retries = 5
-            retry_count = 0
+        page = asyncio.create_task(self._fetch_inventory_page(url, params))
+        try:
+            while page:
+                data = await page
+                page = None
+                
+                if not data:
+                    break
+                
+                more_items = data.get('more_items', 0) == 1
+                last_assetid = data.get('last_assetid')
+                
+                # request the next page right away, hand out this one while it is in flight
+                if more_items and last_assetid:
+                    next_params = {**params, 'start_assetid': last_assetid}
+                    page = asyncio.create_task(self._fetch_inventory_page(url, next_params))
+                
+                current_assets = data.get('assets', [])
+                total += len(current_assets)
+                print(f"The retrieved {len(current_assets)} entries. Total: {total}. Other items: {more_items}")
+                
+                yield data
+        finally:
+            if page:
+                page.cancel()
+    
+    async def _fetch_inventory_page(self, url, params, max_retries=5):
+        retry_count = 0
+        
+        while retry_count < max_retries:
+            # retries take a slot too, price requests share the same schedule
+            await self.limiter.wait()
             
-            while retry_count < max_retries:
-                try:
-                    resp = self.session.get(url, params=params, timeout=10)
-                    
-                    if resp.status_code == 429:
-                        self.limiter.handle_429()
+            try:
+                async with self.session.get(url, params=params) as resp:
+                    if resp.status == 429:
+                        await self.limiter.handle_429()
                         retry_count += 1
                         continue
                     
                     resp.raise_for_status()
                     self.limiter.success()
                     
-                    data = resp.json()
-                    break 
-                    
-                except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
-                    retry_count += 1
-                    if retry_count >= max_retries:
-                        print(f"Failed to retrieve inventory after {max_retries} attempts: {e}")
-                        return {'assets': all_assets, 'descriptions': descriptions}
-                    
-                    delay = min(2 ** retry_count, 60)
-                    print(f"Inventory retrieval error: {e}. Waiting for {delay}s before next attempt.")
-                    time.sleep(delay)
-            
-            if not data:
-                break
+                    return await self._read_inventory_page(resp)
                 
-            if first:
-                descriptions = data.get('descriptions', [])
-                first = False
-            
-            current_assets = data.get('assets', [])
-            all_assets.extend(current_assets)
-            
-            more_items = data.get('more_items', 0) == 1
-            last_assetid = data.get('last_assetid')
-            
-            print(f"The retrieved {len(current_assets)} entries. Total: {len(all_assets)}. Other items: {more_items}")
-            
-            if not more_items or not last_assetid:
-                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) + JSON_ERRORS as e:
+                retry_count += 1
+                if retry_count >= max_retries:
+                    print(f"Failed to retrieve inventory after {max_retries} attempts: {e}")
+                    return None
+                
+                delay = self.limiter.next_backoff()
+                print(f"Inventory retrieval error: {e}. Waiting for {delay:.1f}s before next attempt.")
+                await asyncio.sleep(delay)
+        
+        return None
+    
+    async def _read_inventory_page(self, resp):
+        if ijson is None:
+            return json_loads(await resp.read())
         
-        return {'assets': all_assets, 'descriptions': descriptions}
+        # parse top-level keys as the body streams in, never holding the raw page in memory
+        data = {}
+        async for key, value in ijson.kvitems_async(resp.content, '', use_float=True):
+            data[key] = value
+        return data
     
-    def get_price(self, market_hash_name, currency=3, max_retries=5):
+    async def get_price(self, market_hash_name, currency=3, max_retries=5):
         # first try from cache (if exists)
         cache_result = self.cache.get(market_hash_name)
         if cache_result is not None:
             return cache_result
         
-        encoded_name = quote(market_hash_name, safe='')
-        url = f'https://steamcommunity.com/market/listings/730/{encoded_name}/render'
+        # someone is already fetching this name -> wait for their result
+        pending = self._inflight.get(market_hash_name)
+        if pending is not None:
+            return await pending
+        
+        pending = asyncio.get_running_loop().create_future()
+        self._inflight[market_hash_name] = pending
+        try:
+            async with self._semaphore:
+                result = await self._fetch_price(market_hash_name, currency, max_retries)
+            pending.set_result(result)
+            return result
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            if not pending.done():
+                pending.cancel()
+            del self._inflight[market_hash_name]
+    
+    async def _fetch_price(self, market_hash_name, currency, max_retries):
+        # small summary JSON instead of the full listings render
+        url = 'https://steamcommunity.com/market/priceoverview/'
         
         params = {
-            'start': 0,
-            'count': 1,
+            'appid': 730,
             'currency': currency,
-            'format': 'json',
-            'language': 'english'
+            'market_hash_name': market_hash_name
         }
         
         for attempt in range(max_retries + 1):
-            self.limiter.wait()
+            await self.limiter.wait()
             
             try:
-                resp = self.session.get(url, params=params, timeout=10)
-                
-                if resp.status_code == 429:
-                    self.limiter.handle_429()
-                    continue
-                
-                resp.raise_for_status()
-                self.limiter.success()
+                async with self.session.get(url, params=params) as resp:
+                    if resp.status == 429:
+                        await self.limiter.handle_429()
+                        continue
+                    
+                    if await self._is_unknown_item(resp):
+                        # a final answer, not an error -> reset the backoff
+                        self.limiter.success()
+                        result = {'price': 0.0, 'quantity': 0}
+                        self.cache.set(market_hash_name, result)
+                        return result
+                    
+                    resp.raise_for_status()
+                    self.limiter.success()
+                    
+                    data = json_loads(await resp.read())
                 
-                data = resp.json()
-                listinginfo = data.get('listinginfo', {})
+                lowest_price = data.get('lowest_price')
                 
-                if not listinginfo:
+                if not data.get('success') or not lowest_price:
                     result = {'price': 0.0, 'quantity': 0}
                 else:
-                    info = next(iter(listinginfo.values()))
-                    price_raw = info.get('converted_price')
-                    fee_raw = info.get('converted_fee', 0)
-                    quantity = info.get('quantity', 0)
-                    
-                    price = (price_raw + fee_raw) / 100 if price_raw is not None else 0.0
-                    result = {'price': price, 'quantity': quantity}
+                    # volume = items sold in the last 24h
+                    quantity = parse_volume(data.get('volume'))
+                    result = {'price': parse_price(lowest_price), 'quantity': quantity}
                 
                 # Cache save
                 self.cache.set(market_hash_name, result)
                 return result
                 
-            except requests.exceptions.HTTPError as e:
-                status = e.response.status_code if e.response is not None else None
-                if status == 429 and attempt < max_retries:
-                    self.limiter.handle_429()
+            except aiohttp.ClientResponseError as e:
+                if e.status == 429 and attempt < max_retries:
+                    await self.limiter.handle_429()
                     continue
                 print(f"Chyba pri načítaní {market_hash_name}: {e}")
             except Exception as e:
@@ -232,50 +383,83 @@ class SteamMarketAPI:
             
             if attempt == max_retries:
                 return {'price': 0.0, 'quantity': 0}
+    
+    async def _is_unknown_item(self, resp):
+        # priceoverview answers 404, or 500 with {"success": false}, for names it does not know
+        if resp.status == 404:
+            return True
+        if resp.status != 500:
+            return False
+        
+        try:
+            body = json_loads(await resp.read())
+        except (aiohttp.ClientError, ValueError):
+            return False
+        return isinstance(body, dict) and body.get('success') is False
 
 
-def main():
+async def main():
     STEAM_ID = "YOUR_STEAM_ID_HERE"  # STEAM_ID
 
     api = SteamMarketAPI(STEAM_ID, cache_duration_hours=24)
-    inventory = api.fetch_csgo_inventory()
+    try:
+        await run(api)
+    finally:
+        await api.close()
+
+
+async def run(api):
+    total = 0.0
+    asset_count = 0
+    # stackable items (cases, keys, stickers) share a name -> price each name only once
+    counts = Counter()
+    prices = {}
     
-    if not inventory['assets']:
+    # start pricing each page's items while the next page is still downloading
+    async for page in api.iter_pages():
+        # Vytvorenie mapy pre popis položiek
+        # classid alone decides the market_hash_name (instanceid only carries nametags/stickers)
+        name_by_class = {
+            d['classid']: d['market_hash_name']
+            for d in page.get('descriptions', [])
+        }
+        
+        assets = page.get('assets', [])
+        asset_count += len(assets)
+        for asset in assets:
+            name = name_by_class.get(asset['classid'])
+            if not name:
+                continue
+            
+            counts[name] += 1
+            if name not in prices:
+                prices[name] = asyncio.create_task(api.get_price(name))
+    
+    if not asset_count:
         print("Failed to retrieve inventory items.")
         return
     
-    print(f"Items in inventory : {len(inventory['assets'])}")
-    
-    # Vytvorenie mapy pre popis položiek
-    desc_map = {
-        (d['classid'], d['instanceid']): d
-        for d in inventory['descriptions']
-    }
-    
-    total = 0.0
-    items = []
-    for asset in inventory['assets']:
-        key = (asset['classid'], asset['instanceid'])
-        desc = desc_map.get(key)
-        if not desc:
-            continue
-        
-        name = desc['market_hash_name']
-        items.append((name, desc))
+    print(f"Items in inventory : {asset_count}")
     
+    # price for all unique items (requests run concurrently)
+    results = await asyncio.gather(*prices.values())
     
     print("\n" + "-" * 60)
     print(f"{'NAME':<40} {'PRICE (€)':>10} {'COUNT':>8}")
     print("-" * 60)
     
-    # price for all assets
-    for name, desc in items:
-        price_info = api.get_price(name)
+    # one write for the whole table instead of a (flushed) print per item
+    lines = []
+    for name, price_info in zip(prices, results):
+        count = counts[name]
         price = price_info.get('price', 0.0) if price_info else 0.0
         
         if price > 0:
-            total += price
-            print(f"{name:<40} {price:>10.2f} € {1:>8}")
+            total += price * count
+            lines.append(f"{name:<40} {price:>10.2f} € {count:>8}")
+    
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
     
     # total value
     print("-" * 60)
@@ -287,4 +471,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+import importlib.util
+import os
+import unittest
+
+# the script's file name has a dash, so load it by path
+_path = os.path.join(os.path.dirname(__file__), '..', 'inv-checker.py')
+_spec = importlib.util.spec_from_file_location('inv_checker', _path)
+inv_checker = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(inv_checker)
+
+
+class ParsePriceTest(unittest.TestCase):
+    CASES = [
+        # EUR
+        ('1,23€', 1.23),
+        ('1.234,56€', 1234.56),
+        ('12,--€', 12.0),
+        # USD
+        ('$0.03', 0.03),
+        ('$1,234.56', 1234.56),
+        # RUB
+        ('5,40 pуб.', 5.40),
+        ('1 234,56 pуб.', 1234.56),
+        # JPY / TWD have no decimals
+        ('¥ 1,234', 1234.0),
+        ('¥ 98', 98.0),
+        ('NT$ 1,234', 1234.0),
+        ('', 0.0),
+    ]
+    
+    def test_formats(self):
+        for text, expected in self.CASES:
+            with self.subTest(text=text):
+                self.assertAlmostEqual(inv_checker.parse_price(text), expected)
+
+
+
+class ParseVolumeTest(unittest.TestCase):
+    # bad input must give 0, not raise (a raise made _fetch_price re-request the price)
+    CASES = [
+        ('1,234', 1234),
+        ('87', 87),
+        (None, 0),
+        ('', 0),
+        ('abc', 0),
+    ]
+    
+    def test_formats(self):
+        for text, expected in self.CASES:
+            with self.subTest(text=text):
+                self.assertEqual(inv_checker.parse_volume(text), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
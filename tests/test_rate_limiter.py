@@ -0,0 +1,42 @@
+import asyncio
+import importlib.util
+import os
+import unittest
+
+# the script's file name has a dash, so load it by path
+_path = os.path.join(os.path.dirname(__file__), '..', 'inv-checker.py')
+_spec = importlib.util.spec_from_file_location('inv_checker', _path)
+inv_checker = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(inv_checker)
+
+
+class RateLimiterTest(unittest.IsolatedAsyncioTestCase):
+    async def test_429_pauses_callers_with_reserved_slots(self):
+        limiter = inv_checker.RateLimiter(base_delay=0.05, max_delay=0.3)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        fired = []
+        
+        async def caller(i):
+            await limiter.wait()
+            fired.append((i, loop.time() - start))
+            if i == 0:
+                await asyncio.sleep(0.01)  # response time; the others reserve their slots meanwhile
+                limiter.next_backoff = lambda: 0.3  # fixed pause instead of jitter
+                await limiter.handle_429()
+        
+        await asyncio.gather(*(caller(i) for i in range(6)))
+        
+        # only caller 0 went out before the pause, everyone else waited it out
+        self.assertEqual(fired[0][0], 0)
+        for i, at in fired[1:]:
+            self.assertGreaterEqual(at, 0.3 - 0.01, f"caller {i} fired during the 429 pause")
+        
+        # and they are still spaced base_delay apart afterwards
+        times = sorted(at for _, at in fired[1:])
+        for a, b in zip(times, times[1:]):
+            self.assertGreaterEqual(b - a, 0.05 - 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()